@@ -12,6 +12,7 @@ from app.core.config import get_settings
 from app.auth.redis import add_to_blacklist, is_blacklisted
 from app.schemas.token import TokenType
 from app.database import get_db
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.user import User
 
@@ -142,7 +143,7 @@ async def get_current_user(
         payload = await decode_token(token, TokenType.ACCESS)
         user_id = payload["sub"]
         
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
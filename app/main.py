@@ -18,35 +18,36 @@ The application follows a RESTful API design with proper separation of concerns:
 from contextlib import asynccontextmanager  # Used for startup/shutdown events
 from datetime import datetime, timezone, timedelta
 from uuid import UUID  # For type validation of UUIDs in path parameters
-from typing import List
+from typing import List, Optional
 
 # FastAPI imports
-from fastapi import Body, FastAPI, Depends, HTTPException, status, Request, Form
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Query, Path
+from fastapi.middleware.gzip import GZipMiddleware  # Response compression
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles  # For serving static files (CSS, JS)
 from fastapi.templating import Jinja2Templates  # For HTML templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
-from sqlalchemy.orm import Session  # SQLAlchemy database session
-
-import uvicorn  # ASGI server for running FastAPI apps
+from sqlalchemy import select  # 2.0-style query construction
+from sqlalchemy.ext.asyncio import AsyncSession  # Async database session (asyncpg)
+from sqlalchemy.orm import Session, raiseload  # SQLAlchemy database session
 
 # Application imports
 from app.auth.dependencies import get_current_active_user  # Authentication dependency
 from app.models.calculation import Calculation  # Database model for calculations
 from app.models.user import User  # Database model for users
-from app.schemas.calculation import CalculationBase, CalculationResponse, CalculationUpdate  # API request/response schemas
+from app.schemas.calculation import CalculationBase, CalculationResponse, CalculationResponseList, CalculationUpdate  # API request/response schemas
 from app.schemas.token import TokenResponse  # API token schema
 from app.schemas.user import UserCreate, UserResponse, UserLogin  # User schemas
-from app.database import Base, get_db, engine  # Database connection
-from typing import List
-from typing import List, Optional
-from fastapi import Query, Path
-from app.operations.statistics import (
+from app.database import Base, get_db, get_async_db, engine  # Database connection
+from app.core.config import settings  # Application settings
+from app.operations.statistics import (  # Reports feature business logic
     calculate_user_statistics,
     get_paginated_history,
     get_operation_statistics
 )
+
 # ------------------------------------------------------------------------------
 # Create tables on startup using the lifespan event
 # ------------------------------------------------------------------------------
@@ -73,17 +74,30 @@ app = FastAPI(
     title="Calculations API",
     description="API for managing calculations",
     version="1.0.0",
-    lifespan=lifespan  # Pass our lifespan context manager
+    lifespan=lifespan,  # Pass our lifespan context manager
+    default_response_class=ORJSONResponse  # Serialize JSON with orjson instead of stdlib json
 )
 
+# Compress responses larger than 1 KB (HTML pages, statistics and history JSON).
+# Level 5 keeps most of the size reduction at a fraction of level 9's CPU cost.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # ------------------------------------------------------------------------------
 # Static Files and Templates Configuration
 # ------------------------------------------------------------------------------
 # Mount the static files directory for serving CSS, JS, and images
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Set up Jinja2 templates directory for HTML rendering
-templates = Jinja2Templates(directory="templates")
+# Set up Jinja2 templates for HTML rendering. Compiled templates are kept in
+# a bytecode cache on disk so new workers skip the compile step, and template
+# files are only re-checked for changes when running in debug mode.
+template_env = Environment(
+    loader=FileSystemLoader("templates"),
+    autoescape=True,
+    auto_reload=settings.DEBUG,
+    bytecode_cache=FileSystemBytecodeCache(),
+)
+templates = Jinja2Templates(env=template_env)
 
 
 # ------------------------------------------------------------------------------
@@ -93,7 +107,7 @@ templates = Jinja2Templates(directory="templates")
 # These provide a user-friendly web interface alongside the API
 
 @app.get("/", response_class=HTMLResponse, tags=["web"])
-def read_index(request: Request):
+async def read_index(request: Request):
     """
     Landing page.
     
@@ -102,7 +116,7 @@ def read_index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 @app.get("/login", response_class=HTMLResponse, tags=["web"])
-def login_page(request: Request):
+async def login_page(request: Request):
     """
     Login page.
     
@@ -111,7 +125,7 @@ def login_page(request: Request):
     return templates.TemplateResponse("login.html", {"request": request})
 
 @app.get("/register", response_class=HTMLResponse, tags=["web"])
-def register_page(request: Request):
+async def register_page(request: Request):
     """
     Registration page.
     
@@ -120,7 +134,7 @@ def register_page(request: Request):
     return templates.TemplateResponse("register.html", {"request": request})
 
 @app.get("/dashboard", response_class=HTMLResponse, tags=["web"])
-def dashboard_page(request: Request):
+async def dashboard_page(request: Request):
     """
     Dashboard page, listing calculations & new calculation form.
     
@@ -134,7 +148,7 @@ def dashboard_page(request: Request):
     return templates.TemplateResponse("dashboard.html", {"request": request})
 
 @app.get("/dashboard/view/{calc_id}", response_class=HTMLResponse, tags=["web"])
-def view_calculation_page(request: Request, calc_id: str):
+async def view_calculation_page(request: Request, calc_id: str):
     """
     Page for viewing a single calculation (Read).
     
@@ -151,7 +165,7 @@ def view_calculation_page(request: Request, calc_id: str):
     return templates.TemplateResponse("view_calculation.html", {"request": request, "calc_id": calc_id})
 
 @app.get("/dashboard/edit/{calc_id}", response_class=HTMLResponse, tags=["web"])
-def edit_calculation_page(request: Request, calc_id: str):
+async def edit_calculation_page(request: Request, calc_id: str):
     """
     Page for editing a calculation (Update).
     
@@ -167,32 +181,9 @@ def edit_calculation_page(request: Request, calc_id: str):
     """
     return templates.TemplateResponse("edit_calculation.html", {"request": request, "calc_id": calc_id})
 
-"""
-Statistics and History API Routes
-
-ADD these routes to your existing app/main.py file.
-
-INTEGRATION STEPS:
-1. Add these imports at the top of main.py (after your existing imports)
-2. Add these route definitions after your existing calculation routes
-3. Create app/operations/statistics.py with the statistics operations code
-
-Author: [Your Name]
-Date: December 2025
-"""
-
-# ========== ADD THESE IMPORTS AT TOP OF main.py ==========
-from app.operations.statistics import (
-    calculate_user_statistics,
-    get_paginated_history,
-    get_operation_statistics
-)
-from typing import Optional
-from fastapi import Query, Path
-
-
-# ========== ADD THESE ROUTES AFTER YOUR EXISTING CALCULATION ROUTES ==========
-
+# ------------------------------------------------------------------------------
+# Statistics and History Endpoints (Reports Feature)
+# ------------------------------------------------------------------------------
 @app.get(
     "/api/statistics",
     tags=["statistics"],
@@ -221,7 +212,7 @@ def get_statistics(
     """
     try:
         statistics = calculate_user_statistics(db, current_user.id)
-        return JSONResponse(content=statistics)
+        return ORJSONResponse(content=statistics)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -239,6 +230,7 @@ def get_history(
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
     operation: Optional[str] = Query(None, description="Filter by operation type"),
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -252,6 +244,7 @@ def get_history(
         page: Page number to retrieve (1-indexed)
         page_size: Number of items per page (1-100)
         operation: Optional filter for operation type
+        after: Optional cursor to continue from instead of a page number
         
     Returns:
         Dict: Paginated history with metadata including:
@@ -260,6 +253,7 @@ def get_history(
             - page: Current page number
             - page_size: Items per page
             - total_pages: Total number of pages
+            - next_cursor: Cursor for the following page, or None
     """
     try:
         history = get_paginated_history(
@@ -267,9 +261,10 @@ def get_history(
             user_id=current_user.id,
             page=page,
             page_size=page_size,
-            operation_filter=operation
+            operation_filter=operation,
+            after=after
         )
-        return JSONResponse(content=history)
+        return ORJSONResponse(content=history)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -309,7 +304,7 @@ def get_operation_stats(
     """
     try:
         stats = get_operation_statistics(db, current_user.id, operation)
-        return JSONResponse(content=stats)
+        return ORJSONResponse(content=stats)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -317,10 +312,8 @@ def get_operation_stats(
         )
 
 
-# ========== ADD THIS HTML ROUTE FOR REPORTS PAGE ==========
-
 @app.get("/reports", response_class=HTMLResponse, tags=["web"])
-def reports_page(request: Request):
+async def reports_page(request: Request):
     """
     Render the Reports/Statistics page.
     
@@ -330,6 +323,8 @@ def reports_page(request: Request):
     Note: Authentication is handled client-side via JavaScript
     """
     return templates.TemplateResponse("reports.html", {"request": request})
+
+
 # ------------------------------------------------------------------------------
 # Health Endpoint
 # ------------------------------------------------------------------------------
@@ -435,233 +430,152 @@ def login_form(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = D
     status_code=status.HTTP_201_CREATED,
     tags=["calculations"],
 )
-def create_calculation(
+async def create_calculation(
     calculation_data: CalculationBase,
     current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new calculation for the authenticated user.
     Automatically computes the 'result'.
     """
     try:
-        new_calculation = Calculation.create(
-            calculation_type=calculation_data.type,
-            user_id=current_user.id,
-            inputs=calculation_data.inputs,
-        )
-        new_calculation.result = new_calculation.get_result()
-
-        db.add(new_calculation)
-        db.commit()
-        db.refresh(new_calculation)
-        return new_calculation
-
+        async with db.begin():
+            new_calculation = Calculation.create(
+                calculation_type=calculation_data.type,
+                user_id=current_user.id,
+                inputs=calculation_data.inputs,
+            )
+            new_calculation.result = new_calculation.get_result()
+            db.add(new_calculation)
     except ValueError as e:
-        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
+    return new_calculation
+
 
 # Browse / List Calculations
 @app.get("/calculations", response_model=List[CalculationResponse], tags=["calculations"])
-def list_calculations(
+async def list_calculations(
     current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    List all calculations belonging to the current authenticated user.
+    List all calculations belonging to the current authenticated user,
+    newest first.
+    
+    Rows are selected as plain columns and wrapped without re-validation,
+    then serialized directly to JSON; response_model documents the shape.
+    """
+    result = await db.execute(
+        select(
+            Calculation.id,
+            Calculation.user_id,
+            Calculation.type,
+            Calculation.inputs,
+            Calculation.result,
+            Calculation.created_at,
+            Calculation.updated_at
+        )
+        .where(Calculation.user_id == current_user.id)
+        .order_by(Calculation.created_at.desc())
+    )
+    calculations = [CalculationResponse.from_row(row) for row in result]
+    return Response(
+        content=CalculationResponseList.dump_json(calculations),
+        media_type="application/json"
+    )
+
+
+# Shared lookup for the routes that address a single calculation
+async def get_owned_calculation(
+    calc_id: UUID,
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> Calculation:
+    """
+    Dependency that loads a calculation by its UUID, if it belongs to the current user.
+
+    Raises:
+        HTTPException: 404 if no such calculation exists for this user
     """
-    calculations = db.query(Calculation).filter(Calculation.user_id == current_user.id).all()
-    return calculations
+    result = await db.execute(
+        select(Calculation).options(raiseload("*")).where(
+            Calculation.id == calc_id,
+            Calculation.user_id == current_user.id
+        )
+    )
+    calculation = result.scalar_one_or_none()
+    if not calculation:
+        raise HTTPException(status_code=404, detail="Calculation not found.")
+    return calculation
 
 
 # Read / Retrieve a Specific Calculation by ID
 @app.get("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
-def get_calculation(
-    calc_id: str,
-    current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+async def get_calculation(
+    calculation: Calculation = Depends(get_owned_calculation)
 ):
     """
     Retrieve a single calculation by its UUID, if it belongs to the current user.
     """
-    try:
-        calc_uuid = UUID(calc_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid calculation id format.")
-
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
-        Calculation.user_id == current_user.id
-    ).first()
-    if not calculation:
-        raise HTTPException(status_code=404, detail="Calculation not found.")
-
     return calculation
 
 
 # Edit / Update a Calculation
 @app.put("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
-def update_calculation(
-    calc_id: str,
+async def update_calculation(
     calculation_update: CalculationUpdate,
-    current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    calculation: Calculation = Depends(get_owned_calculation),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update the inputs (and thus the result) of a specific calculation.
     """
-    try:
-        calc_uuid = UUID(calc_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid calculation id format.")
-
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
-        Calculation.user_id == current_user.id
-    ).first()
-    if not calculation:
-        raise HTTPException(status_code=404, detail="Calculation not found.")
-
-    if calculation_update.inputs is not None:
+    # Only recompute when the inputs actually changed; the type is immutable
+    if calculation_update.inputs is not None and calculation_update.inputs != calculation.inputs:
         calculation.inputs = calculation_update.inputs
         calculation.result = calculation.get_result()
 
     calculation.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(calculation)
+    await db.commit()
     return calculation
 
 
 # Delete a Calculation
 @app.delete("/calculations/{calc_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["calculations"])
-def delete_calculation(
-    calc_id: str,
-    current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+async def delete_calculation(
+    calculation: Calculation = Depends(get_owned_calculation),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a calculation by its UUID, if it belongs to the current user.
     """
-    try:
-        calc_uuid = UUID(calc_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid calculation id format.")
-
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
-        Calculation.user_id == current_user.id
-    ).first()
-    if not calculation:
-        raise HTTPException(status_code=404, detail="Calculation not found.")
-
-    db.delete(calculation)
-    db.commit()
+    await db.delete(calculation)
+    await db.commit()
     return None
 
-# ------------------------------------------------------------------------------
-# Statistics and History Endpoints (Reports Feature)
-# ------------------------------------------------------------------------------
-@app.get(
-    "/api/statistics",
-    tags=["statistics"],
-    summary="Get User Statistics"
-)
-def get_statistics(
-    current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get comprehensive statistics for current user's calculations.
-
-    Returns detailed metrics including totals, averages, breakdowns,
-    and trends to support the Report/History dashboard feature.
-    """
-    try:
-        statistics = calculate_user_statistics(db, current_user.id)
-        return JSONResponse(content=statistics)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error calculating statistics: {str(e)}"
-        )
-
-
-@app.get(
-    "/api/history",
-    tags=["statistics"],
-    summary="Get Calculation History"
-)
-def get_history(
-    page: int = Query(1, ge=1, description="Page number (1-indexed)"),
-    page_size: int = Query(10, ge=1, le=100, description="Items per page"),
-    operation: Optional[str] = Query(None, description="Filter by operation type"),
-    current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get paginated calculation history for current user.
-
-    Supports pagination and filtering to efficiently browse large
-    calculation histories. Orders results by creation date (newest first).
-    """
-    try:
-        history = get_paginated_history(
-            db=db,
-            user_id=current_user.id,
-            page=page,
-            page_size=page_size,
-            operation_filter=operation
-        )
-        return JSONResponse(content=history)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving history: {str(e)}"
-        )
-
-
-@app.get(
-    "/api/statistics/operation/{operation}",
-    tags=["statistics"],
-    summary="Get Operation-Specific Statistics"
-)
-def get_operation_stats(
-    operation: str = Path(..., description="Operation type to analyze"),
-    current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get detailed statistics for a specific operation type.
-    """
-    try:
-        stats = get_operation_statistics(db, current_user.id, operation)
-        return JSONResponse(content=stats)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving operation statistics: {str(e)}"
-        )
-
-
-@app.get("/reports", response_class=HTMLResponse, tags=["web"])
-def reports_page(request: Request):
-    """
-    Render the Reports/Statistics page.
-
-    Displays comprehensive analytics dashboard with charts,
-    statistics, and calculation history.
-    """
-    return templates.TemplateResponse("reports.html", {"request": request})
-
 # ------------------------------------------------------------------------------
 # Main Block to Run the Server
 # ------------------------------------------------------------------------------
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("app.main:app", host="127.0.0.1", port=8001, log_level="info")
+    import os
+    import uvicorn  # ASGI server for running FastAPI apps
+    from app.database_init import init_db
+    # Create the schema once before the workers start, so their concurrent
+    # create_all calls in lifespan find every table already in place
+    init_db()
+    uvicorn.run(
+        "app.main:app",
+        host="127.0.0.1",
+        port=8001,
+        # One process per worker; each worker has its own DB pools, so
+        # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) must fit max_connections
+        workers=int(os.getenv("WEB_CONCURRENCY", 4)),
+        # loop/http default to "auto", which picks uvloop and httptools when
+        # installed (uvloop is not available on Windows)
+        log_level="info",
+    )
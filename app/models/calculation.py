@@ -15,12 +15,14 @@ basic mathematical operations: addition, subtraction, multiplication, and divisi
 """
 
 from datetime import datetime
+from functools import reduce
+import math
+import operator
 import uuid
 from typing import List
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Float
+from sqlalchemy import DDL, Column, Date, DateTime, Float, ForeignKey, Index, Integer, JSON, String, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, declared_attr
-from sqlalchemy.ext.declarative import declared_attr
 from app.database import Base
 
 class AbstractCalculation:
@@ -173,13 +175,12 @@ class AbstractCalculation:
         Raises:
             ValueError: If the calculation_type is not supported
         """
-        calculation_classes = {
-            'addition': Addition,
-            'subtraction': Subtraction,
-            'multiplication': Multiplication,
-            'division': Division,
-        }
-        calculation_class = calculation_classes.get(calculation_type.lower())
+        # Types arrive already lowercased from the API schema, so try an exact
+        # match before falling back to a case-insensitive lookup
+        calculation_class = (
+            CALCULATION_CLASSES.get(calculation_type)
+            or CALCULATION_CLASSES.get(calculation_type.lower())
+        )
         if not calculation_class:
             raise ValueError(f"Unsupported calculation type: {calculation_type}")
         return calculation_class(user_id=user_id, inputs=inputs)
@@ -246,6 +247,17 @@ class Calculation(Base, AbstractCalculation):
     The concrete calculation subclasses (Addition, Subtraction, etc.) will
     inherit from this class and specify their own polymorphic identities.
     """
+    __table_args__ = (
+        # Serves the per-user history listing newest-first, including
+        # keyset pagination on (created_at, id)
+        Index("ix_calc_user_created", "user_id", "created_at", "id"),
+        # Serves the per-operation statistics and history filters
+        Index("ix_calc_user_type", "user_id", "type"),
+        # Serves the statistics version probe (COUNT and MAX(updated_at)
+        # per user) as an index-only aggregate
+        Index("ix_calc_user_updated", "user_id", "updated_at"),
+    )
+
     __mapper_args__ = {
         "polymorphic_on": "type",
         "polymorphic_identity": "calculation",
@@ -308,10 +320,8 @@ class Subtraction(Calculation):
             raise ValueError("Inputs must be a list of numbers.")
         if len(self.inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
-            result -= value
-        return result
+        # reduce() with a C operator runs the whole sequence without per-element bytecode
+        return reduce(operator.sub, self.inputs)
 
 class Multiplication(Calculation):
     """
@@ -328,6 +338,8 @@ class Multiplication(Calculation):
         """
         Calculate the product of all input values.
         
+        Uses math.prod(), which multiplies in C rather than in a Python loop.
+        
         Returns:
             float: The product of all input values
             
@@ -338,10 +350,7 @@ class Multiplication(Calculation):
             raise ValueError("Inputs must be a list of numbers.")
         if len(self.inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
-        result = 1
-        for value in self.inputs:
-            result *= value
-        return result
+        return math.prod(self.inputs)
 
 class Division(Calculation):
     """
@@ -375,9 +384,91 @@ class Division(Calculation):
             raise ValueError("Inputs must be a list of numbers.")
         if len(self.inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
-            if value == 0:
-                raise ValueError("Cannot divide by zero.")
-            result /= value
-        return result
+        if 0 in self.inputs[1:]:
+            raise ValueError("Cannot divide by zero.")
+        return reduce(operator.truediv, self.inputs)
+
+# Maps each calculation type to its subclass. Built once at import time and
+# used by Calculation.create() to dispatch with a single dict lookup.
+CALCULATION_CLASSES = {
+    'addition': Addition,
+    'subtraction': Subtraction,
+    'multiplication': Multiplication,
+    'division': Division,
+}
+
+
+class CalculationDaily(Base):
+    """
+    Number of calculations each user created per day.
+    
+    Rows are maintained by PostgreSQL triggers on the calculations table
+    (see CALCULATIONS_DAILY_TRIGGER below), so the daily trend is read with
+    a primary-key range scan instead of grouping the user's calculations on
+    every request. The application never writes to this table.
+    """
+    __tablename__ = "calculations_daily"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey('users.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CalculationDaily(user_id={self.user_id}, day={self.day}, count={self.count})>"
+
+
+# Keeps calculations_daily in step with inserts and deletes on calculations.
+# Runs after every create_all, once all tables exist. Every uvicorn worker
+# calls create_all at startup, so the transaction-scoped advisory lock makes
+# concurrent runs take turns, and the function and trigger are only created
+# when missing. The first time the trigger is installed the summary is
+# backfilled from the calculations already stored.
+CALCULATIONS_DAILY_TRIGGER = DDL("""
+SELECT pg_advisory_xact_lock(601013);
+
+DO $do$
+BEGIN
+    IF to_regprocedure('calculations_daily_count()') IS NULL THEN
+        CREATE FUNCTION calculations_daily_count() RETURNS trigger AS $fn$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO calculations_daily (user_id, day, count)
+                VALUES (NEW.user_id, NEW.created_at::date, 1)
+                ON CONFLICT (user_id, day)
+                DO UPDATE SET count = calculations_daily.count + 1;
+                RETURN NEW;
+            END IF;
+            UPDATE calculations_daily SET count = count - 1
+            WHERE user_id = OLD.user_id AND day = OLD.created_at::date;
+            RETURN OLD;
+        END;
+        $fn$ LANGUAGE plpgsql;
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_trigger
+        WHERE tgname = 'calculations_daily_count'
+          AND tgrelid = 'calculations'::regclass
+    ) THEN
+        CREATE TRIGGER calculations_daily_count
+        AFTER INSERT OR DELETE ON calculations
+        FOR EACH ROW EXECUTE FUNCTION calculations_daily_count();
+
+        INSERT INTO calculations_daily (user_id, day, count)
+        SELECT user_id, created_at::date, count(*)
+        FROM calculations
+        GROUP BY user_id, created_at::date
+        ON CONFLICT (user_id, day) DO UPDATE SET count = EXCLUDED.count;
+    END IF;
+END;
+$do$;
+""")
+event.listen(
+    Base.metadata,
+    "after_create",
+    CALCULATIONS_DAILY_TRIGGER.execute_if(dialect="postgresql")
+)
@@ -17,7 +17,7 @@ The User model is designed to follow security best practices:
 
 import uuid
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import Column, String, Boolean, DateTime, or_
+from sqlalchemy import Column, String, Boolean, DateTime, or_, select
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 from app.core.config import get_settings
@@ -180,9 +180,11 @@ class User(Base):
             raise ValueError("Password must be at least 6 characters long")
         
         # Check for duplicate email or username
-        existing_user = db.query(cls).filter(
-            or_(cls.email == user_data["email"], cls.username == user_data["username"])
-        ).first()
+        existing_user = db.execute(
+            select(cls).where(
+                or_(cls.email == user_data["email"], cls.username == user_data["username"])
+            ).limit(1)
+        ).scalars().first()
         if existing_user:
             raise ValueError("Username or email already exists")
         
@@ -213,9 +215,11 @@ class User(Base):
         Returns:
             dict: Authentication result with tokens and user data, or None if authentication fails
         """
-        user = db.query(cls).filter(
-            or_(cls.username == username_or_email, cls.email == username_or_email)
-        ).first()
+        user = db.execute(
+            select(cls).where(
+                or_(cls.username == username_or_email, cls.email == username_or_email)
+            ).limit(1)
+        ).scalars().first()
 
         if not user or not user.verify_password(password):
             return None
@@ -9,18 +9,54 @@ Author: [Your Name]
 Date: December 2025
 """
 
+import base64
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from sqlalchemy import func, desc, and_
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+from cachetools import LRUCache
+from sqlalchemy import Date, cast, func, desc, and_, select, tuple_
 from sqlalchemy.orm import Session
 from uuid import UUID
-from app.models.calculation import Calculation
+from app.models.calculation import Calculation, CalculationDaily
+
+# Columns returned for listed calculations. Selecting them directly yields
+# plain rows instead of hydrated ORM objects, skipping identity-map and
+# attribute-instrumentation overhead for read-only output.
+CALCULATION_COLUMNS = (
+    Calculation.id,
+    Calculation.type,
+    Calculation.inputs,
+    Calculation.result,
+    Calculation.user_id,
+    Calculation.created_at,
+    Calculation.updated_at,
+)
+
+# Response keys of a history row, in the same order as CALCULATION_COLUMNS
+CALCULATION_KEYS = tuple(column.key for column in CALCULATION_COLUMNS)
+
+# Number of inputs, counted by the database so the JSON arrays are never
+# decoded in Python. ``inputs`` is a JSON (not JSONB) column, and
+# json_array_length exists under that name in both PostgreSQL and SQLite.
+INPUTS_COUNT = func.json_array_length(Calculation.inputs)
+
+# Statistics only change when the user writes a calculation, so results are
+# memoized per (user_id, data version). Any insert, update or delete changes
+# the version, which leaves stale entries unreachable in every worker process
+# without explicit invalidation.
+_statistics_cache = LRUCache(maxsize=1024)
+_statistics_cache_lock = Lock()
 
 
 def calculate_user_statistics(db: Session, user_id: UUID) -> Dict:
     """
     Calculate comprehensive statistics for a user's calculations.
     
+    Results are served from an in-process cache while the user's row count
+    and latest ``updated_at`` are unchanged; the UTC date is part of the key
+    because the daily breakdown covers a rolling window.
+    
     Args:
         db: Database session
         user_id: UUID of the user to calculate statistics for
@@ -28,53 +64,89 @@ def calculate_user_statistics(db: Session, user_id: UUID) -> Dict:
     Returns:
         Dict: Comprehensive statistics object
     """
-    # Get all calculations for the user
-    calculations = db.query(Calculation).filter(
-        Calculation.user_id == user_id
+    # COUNT catches deletes, MAX(updated_at) catches inserts and edits; both
+    # are answered from the (user_id, updated_at) index alone
+    count, last_updated_at = db.execute(
+        select(
+            func.count(),
+            func.max(Calculation.updated_at)
+        ).where(
+            Calculation.user_id == user_id
+        )
+    ).one()
+    
+    # Users without calculations skip the aggregate and recent queries
+    if count == 0:
+        return _empty_user_statistics(db, user_id)
+    
+    key = (user_id, count, last_updated_at, datetime.utcnow().date())
+    with _statistics_cache_lock:
+        statistics = _statistics_cache.get(key)
+    if statistics is None:
+        statistics = _compute_user_statistics(db, user_id)
+        with _statistics_cache_lock:
+            _statistics_cache[key] = statistics
+    return statistics
+
+
+def _empty_user_statistics(db: Session, user_id: UUID) -> Dict:
+    """
+    Statistics object of a user without calculations.
+    
+    The daily breakdown is still the full zero-filled calendar, so the
+    payload has the same shape whether or not the user has data.
+    """
+    return {
+        "total_calculations": 0,
+        "operations_breakdown": {},
+        "average_inputs_count": None,
+        "average_result": None,
+        "most_used_operation": None,
+        "recent_calculations": [],
+        "calculations_by_day": get_calculations_by_day(db, user_id, days=30)
+    }
+
+
+def _compute_user_statistics(db: Session, user_id: UUID) -> Dict:
+    """Run the statistics queries for calculate_user_statistics."""
+    # Aggregate counts, result sums and input counts per operation type
+    # in a single grouped query instead of loading every row into Python
+    rows = db.execute(
+        select(
+            Calculation.type.label('operation'),
+            func.count(Calculation.id).label('count'),
+            func.sum(Calculation.result).label('result_sum'),
+            func.sum(INPUTS_COUNT).label('inputs_count_sum')
+        ).where(
+            Calculation.user_id == user_id
+        ).group_by(Calculation.type)
     ).all()
     
-    total_calculations = len(calculations)
+    total_calculations = sum(row.count for row in rows)
     
-    # Initialize statistics with default values
+    # All calculations deleted since the version query
     if total_calculations == 0:
-        return {
-            "total_calculations": 0,
-            "operations_breakdown": {},
-            "average_inputs_count": None,
-            "average_result": None,
-            "most_used_operation": None,
-            "recent_calculations": [],
-            "calculations_by_day": {}
-        }
+        return _empty_user_statistics(db, user_id)
     
     # Calculate operations breakdown
-    operations_breakdown = {}
-    result_sum = 0.0
-    inputs_count_sum = 0
-    
-    for calc in calculations:
-        # Count operations (normalize type names)
-        operation = calc.type.lower()
-        operations_breakdown[operation] = operations_breakdown.get(operation, 0) + 1
-        
-        # Sum results and input counts
-        result_sum += calc.result
-        inputs_count_sum += len(calc.inputs)
+    operations_breakdown = Counter({row.operation: row.count for row in rows})
+    result_sum = sum(row.result_sum or 0.0 for row in rows)
+    inputs_count_sum = sum(row.inputs_count_sum or 0 for row in rows)
     
     # Calculate averages
     average_inputs_count = round(inputs_count_sum / total_calculations, 2)
     average_result = round(result_sum / total_calculations, 2)
     
     # Find most used operation
-    most_used_operation = max(
-        operations_breakdown.items(),
-        key=lambda x: x[1]
-    )[0] if operations_breakdown else None
+    most_used_operation = operations_breakdown.most_common(1)[0][0]
     
-    # Get recent calculations (last 10)
-    recent_calculations = db.query(Calculation).filter(
-        Calculation.user_id == user_id
-    ).order_by(desc(Calculation.created_at)).limit(10).all()
+    # Get recent calculations (last 10). UUIDs and datetimes are left as-is
+    # for ORJSONResponse, which formats them in C.
+    recent_calculations = db.execute(
+        select(*CALCULATION_COLUMNS).where(
+            Calculation.user_id == user_id
+        ).order_by(desc(Calculation.created_at)).limit(10)
+    ).all()
     
     # Calculate daily breakdown for last 30 days
     calculations_by_day = get_calculations_by_day(db, user_id, days=30)
@@ -87,12 +159,12 @@ def calculate_user_statistics(db: Session, user_id: UUID) -> Dict:
         "most_used_operation": most_used_operation,
         "recent_calculations": [
             {
-                "id": str(calc.id),
+                "id": calc.id,
                 "type": calc.type,
                 "inputs": calc.inputs,
                 "result": calc.result,
-                "created_at": calc.created_at.isoformat(),
-                "updated_at": calc.updated_at.isoformat()
+                "created_at": calc.created_at,
+                "updated_at": calc.updated_at
             }
             for calc in recent_calculations
         ],
@@ -108,57 +180,121 @@ def get_calculations_by_day(
     """
     Get calculation counts grouped by day for trend analysis.
     
+    Counts are read from the trigger-maintained ``calculations_daily``
+    summary rather than grouping the user's calculations. The result always
+    has exactly ``days`` entries, today (UTC) and the ``days - 1`` days
+    before it, with 0 for days without calculations: the calendar comes
+    from PostgreSQL's generate_series, outer-joined to the summary.
+    
     Args:
         db: Database session
         user_id: UUID of the user
-        days: Number of days to look back (default: 30)
+        days: Number of days to report, ending today (default: 30)
         
     Returns:
         Dict mapping date strings (YYYY-MM-DD) to calculation counts
     """
-    # Calculate date range
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
-    
-    # Query calculations grouped by date
-    results = db.query(
-        func.date(Calculation.created_at).label('date'),
-        func.count(Calculation.id).label('count')
-    ).filter(
+    # Date range evaluated by the database clock (whole days). Summary days
+    # are dates of the naive UTC created_at, so "today" is the UTC date rather
+    # than CURRENT_DATE, which follows the session TimeZone. The summary
+    # filter needs no upper bound: the calendar already ends today
+    end_date = func.date(func.timezone('UTC', func.now()))
+    start_date = end_date - (days - 1)
+    
+    # Summary rows of the user within the window (primary-key range scan)
+    daily_counts = select(
+        CalculationDaily.day,
+        CalculationDaily.count
+    ).where(
         and_(
-            Calculation.user_id == user_id,
-            Calculation.created_at >= start_date,
-            Calculation.created_at <= end_date
+            CalculationDaily.user_id == user_id,
+            CalculationDaily.day >= start_date
+        )
+    ).subquery()
+    
+    # One row per calendar day in the window
+    calendar = func.generate_series(
+        start_date, end_date, timedelta(days=1)
+    ).table_valued('day').render_derived()
+    day = cast(calendar.c.day, Date)
+    
+    # No ORDER BY: callers look days up by key, so sorting would be wasted work
+    results = db.execute(
+        select(
+            func.to_char(calendar.c.day, 'YYYY-MM-DD').label('date'),
+            func.coalesce(daily_counts.c.count, 0).label('count')
+        ).select_from(
+            calendar.outerjoin(daily_counts, daily_counts.c.day == day)
         )
-    ).group_by(
-        func.date(Calculation.created_at)
     ).all()
     
-    # Convert to dictionary with string keys
+    # Dates arrive already formatted as YYYY-MM-DD strings
     calculations_by_day = {
-        str(result.date): result.count 
+        result.date: result.count
         for result in results
     }
     
     return calculations_by_day
 
 
+def encode_history_cursor(calc) -> str:
+    """
+    Encode the position of a calculation as an opaque pagination cursor.
+    
+    Args:
+        calc: Last calculation (or history row) of the current page
+        
+    Returns:
+        URL-safe cursor string identifying (created_at, id)
+    """
+    raw = f"{calc.created_at.isoformat()}|{calc.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_history_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_history_cursor.
+    
+    Args:
+        cursor: Cursor string from a previous page
+        
+    Returns:
+        Tuple of (created_at, id) of the last calculation seen
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, calc_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(calc_id)
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid pagination cursor")
+
+
 def get_paginated_history(
     db: Session,
     user_id: UUID,
     page: int = 1,
     page_size: int = 10,
-    operation_filter: Optional[str] = None
+    operation_filter: Optional[str] = None,
+    after: Optional[str] = None
 ) -> Dict:
     """
     Get paginated calculation history with optional filtering.
     
+    Pages can be addressed either by number (OFFSET based) or, for deep
+    history, by the ``next_cursor`` returned with the previous page. Cursor
+    pagination seeks directly to the position on the
+    ``(user_id, created_at, id)`` index, so every page costs the same.
+    
     Args:
         db: Database session
         user_id: UUID of the user
-        page: Page number (1-indexed)
+        page: Page number (1-indexed), ignored when ``after`` is given
         page_size: Number of items per page
         operation_filter: Optional operation type to filter by
+        after: Optional cursor of the last calculation already seen
         
     Returns:
         Dict: Paginated history object with metadata
@@ -169,45 +305,57 @@ def get_paginated_history(
     if page_size < 1 or page_size > 100:
         raise ValueError("Page size must be between 1 and 100")
     
-    # Build base query
-    query = db.query(Calculation).filter(Calculation.user_id == user_id)
+    # Build base filters
+    filters = [Calculation.user_id == user_id]
     
-    # Apply operation filter if provided
+    # Apply operation filter if provided; stored types are always the
+    # lowercase polymorphic identities, so only the input is case-folded
     if operation_filter:
-        query = query.filter(
-            func.lower(Calculation.type) == operation_filter.lower()
+        filters.append(
+            Calculation.type == operation_filter.lower()
         )
     
-    # Get total count for pagination
-    total = query.count()
+    # Newest first; id breaks ties so the cursor position is unambiguous
+    ordering = (desc(Calculation.created_at), desc(Calculation.id))
+    
+    # Count the full filtered set separately: a COUNT(*) OVER () on the page
+    # query would make the database read every matching row before LIMIT
+    total = db.execute(
+        select(func.count(Calculation.id)).where(*filters)
+    ).scalar_one()
+    
+    # Fetch one extra row to know whether another page follows
+    query = select(*CALCULATION_COLUMNS).where(*filters)
+    if after:
+        last_created_at, last_id = decode_history_cursor(after)
+        query = query.where(
+            tuple_(Calculation.created_at, Calculation.id) < (last_created_at, last_id)
+        )
+    else:
+        query = query.offset((page - 1) * page_size)
+    calculations = db.execute(
+        query.order_by(*ordering).limit(page_size + 1)
+    ).all()
+    
+    has_more = len(calculations) > page_size
+    calculations = calculations[:page_size]
     
     # Calculate total pages
     total_pages = (total + page_size - 1) // page_size if total > 0 else 0
     
-    # Get paginated results
-    calculations = query.order_by(
-        desc(Calculation.created_at)
-    ).offset(
-        (page - 1) * page_size
-    ).limit(page_size).all()
-    
+    # Rows hold the CALCULATION_COLUMNS values in order, so zipping them with
+    # their keys builds the row dicts. UUIDs and datetimes are serialized by
+    # ORJSONResponse.
     return {
         "calculations": [
-            {
-                "id": str(calc.id),
-                "type": calc.type,
-                "inputs": calc.inputs,
-                "result": calc.result,
-                "user_id": str(calc.user_id),
-                "created_at": calc.created_at.isoformat(),
-                "updated_at": calc.updated_at.isoformat()
-            }
+            dict(zip(CALCULATION_KEYS, calc))
             for calc in calculations
         ],
         "total": total,
         "page": page,
         "page_size": page_size,
-        "total_pages": total_pages
+        "total_pages": total_pages,
+        "next_cursor": encode_history_cursor(calculations[-1]) if has_more else None
     }
 
 
@@ -227,14 +375,23 @@ def get_operation_statistics(
     Returns:
         Dictionary containing operation-specific statistics
     """
-    calculations = db.query(Calculation).filter(
-        and_(
-            Calculation.user_id == user_id,
-            func.lower(Calculation.type) == operation.lower()
+    # Count, average, min and max computed by a single aggregate query
+    row = db.execute(
+        select(
+            func.count(Calculation.id).label('count'),
+            func.avg(INPUTS_COUNT).label('average_inputs_count'),
+            func.avg(Calculation.result).label('average_result'),
+            func.min(Calculation.result).label('min_result'),
+            func.max(Calculation.result).label('max_result')
+        ).where(
+            and_(
+                Calculation.user_id == user_id,
+                Calculation.type == operation.lower()
+            )
         )
-    ).all()
+    ).one()
     
-    if not calculations:
+    if row.count == 0:
         return {
             'count': 0,
             'average_inputs_count': None,
@@ -243,13 +400,12 @@ def get_operation_statistics(
             'max_result': None
         }
     
-    result_values = [c.result for c in calculations]
-    inputs_counts = [len(c.inputs) for c in calculations]
-    
+    # AVG over an integer expression is NUMERIC in Postgres; convert to float
+    # so the response stays JSON-serializable
     return {
-        'count': len(calculations),
-        'average_inputs_count': round(sum(inputs_counts) / len(calculations), 2),
-        'average_result': round(sum(result_values) / len(calculations), 2),
-        'min_result': round(min(result_values), 2),
-        'max_result': round(max(result_values), 2)
+        'count': row.count,
+        'average_inputs_count': round(float(row.average_inputs_count), 2),
+        'average_result': round(float(row.average_result), 2),
+        'min_result': round(row.min_result, 2),
+        'max_result': round(row.max_result, 2)
     }
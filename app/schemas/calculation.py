@@ -13,7 +13,7 @@ clear error messages when validation fails.
 """
 
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict, model_validator, field_validator
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter, model_validator, field_validator
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
@@ -127,8 +127,9 @@ class CalculationBase(BaseModel):
         if len(self.inputs) < 2:
             raise ValueError("At least two numbers are required for calculation")
         if self.type == CalculationType.DIVISION:
-            # Prevent division by zero (skip the first value as numerator)
-            if any(x == 0 for x in self.inputs[1:]):
+            # Prevent division by zero (skip the first value as numerator);
+            # the containment test scans the list in C and stops at the first 0
+            if 0 in self.inputs[1:]:
                 raise ValueError("Cannot divide by zero")
         return self
 
@@ -271,3 +272,25 @@ class CalculationResponse(CalculationBase):
             }
         }
     )
+
+    @classmethod
+    def from_row(cls, row) -> "CalculationResponse":
+        """
+        Build a response from a trusted database row without validation.
+        
+        Rows read back from the calculations table already hold correctly
+        typed values, so model_construct skips the per-field validators.
+        """
+        return cls.model_construct(
+            id=row.id,
+            user_id=row.user_id,
+            type=CalculationType(row.type),
+            inputs=row.inputs,
+            result=row.result,
+            created_at=row.created_at,
+            updated_at=row.updated_at
+        )
+
+
+# Serializes lists of CalculationResponse straight to JSON bytes in pydantic-core
+CalculationResponseList = TypeAdapter(List[CalculationResponse])
@@ -287,6 +287,24 @@ def test_list_get_update_delete_calculation(base_url: str):
     get_response_after_delete = requests.get(get_url, headers=headers)
     assert get_response_after_delete.status_code == 404, "Expected 404 after deletion"
 
+def test_calculation_invalid_id_rejected(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "BadId",
+        "email": f"calc.badid{uuid4()}@example.com",
+        "username": f"calc_badid_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    token_data = register_and_login(base_url, user_data)
+    headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+    
+    # Malformed UUIDs are rejected by path validation before reaching the database
+    url = f"{base_url}/calculations/not-a-uuid"
+    assert requests.get(url, headers=headers).status_code == 422
+    assert requests.put(url, json={"inputs": [1, 2]}, headers=headers).status_code == 422
+    assert requests.delete(url, headers=headers).status_code == 422
+
 # ---------------------------------------------------------------------------
 # Direct Model Tests for Calculation Operations
 # ---------------------------------------------------------------------------
@@ -2,10 +2,12 @@ import pytest
 from pydantic import ValidationError
 from uuid import uuid4
 from datetime import datetime
+from types import SimpleNamespace
 from app.schemas.calculation import (
     CalculationCreate,
     CalculationUpdate,
-    CalculationResponse
+    CalculationResponse,
+    CalculationResponseList
 )
 
 def test_calculation_create_valid():
@@ -97,3 +99,19 @@ def test_calculation_response_valid():
     assert calc_response.type == "subtraction"
     assert calc_response.inputs == [20, 5]
     assert calc_response.result == 15.5
+
+def test_calculation_response_from_row_matches_validated():
+    """Test that from_row serializes exactly like a validated CalculationResponse."""
+    data = {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "type": "division",
+        "inputs": [100.0, 2.0],
+        "result": 50.0,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
+    row = SimpleNamespace(**data)
+    constructed = CalculationResponse.from_row(row)
+    assert CalculationResponseList.dump_json([constructed]) == \
+        CalculationResponseList.dump_json([CalculationResponse(**data)])
@@ -0,0 +1,155 @@
+# ======================================================================================
+# tests/integration/test_statistics.py
+# ======================================================================================
+# Purpose: Verify the statistics/history operations against the database using the
+#          'test_user_with_calculations' fixture from conftest.py.
+# ======================================================================================
+
+import pytest
+
+from app.models.calculation import Calculation
+from app.operations.statistics import (
+    calculate_user_statistics,
+    decode_history_cursor,
+    encode_history_cursor,
+    get_calculations_by_day,
+    get_operation_statistics,
+    get_paginated_history,
+)
+
+# ======================================================================================
+# User Statistics
+# ======================================================================================
+
+def test_user_statistics_empty(db_session, test_user):
+    """A user without calculations gets the empty statistics template."""
+    stats = calculate_user_statistics(db_session, test_user.id)
+    assert stats["total_calculations"] == 0
+    assert stats["operations_breakdown"] == {}
+    assert stats["average_result"] is None
+    assert stats["most_used_operation"] is None
+    assert stats["recent_calculations"] == []
+    # The daily breakdown keeps its full size, all zeros
+    assert len(stats["calculations_by_day"]) == 30
+    assert set(stats["calculations_by_day"].values()) == {0}
+
+
+def test_user_statistics_aggregates(db_session, test_user_with_calculations):
+    """Totals, breakdown and averages computed in SQL match the fixture data."""
+    user, calculations = test_user_with_calculations
+    stats = calculate_user_statistics(db_session, user.id)
+
+    assert stats["total_calculations"] == len(calculations)
+    assert stats["operations_breakdown"] == {
+        "addition": 2,
+        "subtraction": 1,
+        "multiplication": 1,
+        "division": 1,
+    }
+    assert stats["most_used_operation"] == "addition"
+    # Inputs: 3 + 2 + 2 + 2 + 2 = 11 over 5 calculations
+    assert stats["average_inputs_count"] == 2.2
+    # Results: 18 + 30 + 20 + 20 + 50 = 138 over 5 calculations
+    assert stats["average_result"] == 27.6
+    assert len(stats["recent_calculations"]) == len(calculations)
+
+
+def test_user_statistics_refresh_after_write(db_session, test_user_with_calculations):
+    """Cached statistics are not served once the user adds a calculation."""
+    user, calculations = test_user_with_calculations
+    assert calculate_user_statistics(db_session, user.id)["total_calculations"] == len(calculations)
+
+    calc = Calculation.create("addition", user.id, [1, 2])
+    calc.result = calc.get_result()
+    db_session.add(calc)
+    db_session.commit()
+
+    stats = calculate_user_statistics(db_session, user.id)
+    assert stats["total_calculations"] == len(calculations) + 1
+    assert stats["operations_breakdown"]["addition"] == 3
+
+
+def test_operation_statistics(db_session, test_user_with_calculations):
+    """Per-operation aggregates: additions of [10, 5, 3] and [20, 10]."""
+    user, _ = test_user_with_calculations
+    stats = get_operation_statistics(db_session, user.id, "Addition")
+    assert stats == {
+        "count": 2,
+        "average_inputs_count": 2.5,
+        "average_result": 24.0,
+        "min_result": 18.0,
+        "max_result": 30.0,
+    }
+
+
+def test_operation_statistics_no_matches(db_session, test_user_with_calculations):
+    """An operation the user never used reports a zero count and no values."""
+    user, _ = test_user_with_calculations
+    stats = get_operation_statistics(db_session, user.id, "modulus")
+    assert stats["count"] == 0
+    assert stats["average_result"] is None
+
+
+def test_calculations_by_day_is_dense(db_session, test_user_with_calculations):
+    """Every day of the window is reported, including days without calculations."""
+    user, calculations = test_user_with_calculations
+    by_day = get_calculations_by_day(db_session, user.id, days=30)
+    # Exactly `days` entries: today and the 29 days before it
+    assert len(by_day) == 30
+    assert sum(by_day.values()) == len(calculations)
+
+
+def test_delete_updates_daily_counts_and_statistics(db_session, test_user_with_calculations):
+    """Deleting a calculation decrements the trigger-maintained daily summary."""
+    user, calculations = test_user_with_calculations
+    before = sum(get_calculations_by_day(db_session, user.id, days=30).values())
+    assert calculate_user_statistics(db_session, user.id)["total_calculations"] == len(calculations)
+
+    db_session.delete(calculations[0])
+    db_session.commit()
+
+    after = sum(get_calculations_by_day(db_session, user.id, days=30).values())
+    assert after == before - 1
+    stats = calculate_user_statistics(db_session, user.id)
+    assert stats["total_calculations"] == len(calculations) - 1
+    assert stats["operations_breakdown"]["addition"] == 1
+
+
+# ======================================================================================
+# Paginated History
+# ======================================================================================
+
+def test_history_cursor_round_trip(test_user_with_calculations):
+    """Cursors decode back to the (created_at, id) of the encoded calculation."""
+    _, calculations = test_user_with_calculations
+    calc = calculations[0]
+    assert decode_history_cursor(encode_history_cursor(calc)) == (calc.created_at, calc.id)
+
+
+def test_history_invalid_cursor(db_session, test_user):
+    """A malformed cursor is reported as a ValueError (HTTP 400 in the API)."""
+    with pytest.raises(ValueError, match="Invalid pagination cursor"):
+        get_paginated_history(db_session, test_user.id, after="not-a-cursor")
+
+
+def test_history_cursor_pagination_matches_offset(db_session, test_user_with_calculations):
+    """Following next_cursor visits the same rows, in the same order, as page numbers."""
+    user, calculations = test_user_with_calculations
+
+    by_page = []
+    for page in (1, 2, 3):
+        history = get_paginated_history(db_session, user.id, page=page, page_size=2)
+        by_page += [c["id"] for c in history["calculations"]]
+
+    by_cursor = []
+    cursor = None
+    while True:
+        history = get_paginated_history(db_session, user.id, page_size=2, after=cursor)
+        by_cursor += [c["id"] for c in history["calculations"]]
+        cursor = history["next_cursor"]
+        if cursor is None:
+            break
+
+    assert history["total"] == len(calculations)
+    assert by_cursor == by_page
+    assert len(by_cursor) == len(calculations)